@@ -177,19 +177,18 @@ def get_all_categories() -> list:
     """
     try:
         categories = db.get_all_categories()
-        result = []
 
+        # A category is used in a year if it is in that year's budget template
+        # and has budget entries or transactions that year. Fetch both sets
+        # once instead of querying per category and year.
+        used_keys = db.get_budget_template_keys() & db.get_category_years_with_data()
+        years_by_category = {}
+        for category_id, year in sorted(used_keys):
+            years_by_category.setdefault(category_id, []).append(year)
+
+        result = []
         for cat in categories:
-            # Get years this category is used in budget templates
-            templates = db.get_budget_template_by_year(2020)  # Need to check all years
-            years_used = []
-            for year in db.get_distinct_years():
-                if db.budget_template_exists(year, cat.id):
-                    # Check if has actual data
-                    has_data = (db.category_has_budget_entries_for_year(cat.id, year) or
-                              db.category_has_transactions_for_year(cat.id, year))
-                    if has_data:
-                        years_used.append(year)
+            years_used = years_by_category.get(cat.id, [])
 
             result.append({
                 'id': cat.id,
@@ -340,11 +339,12 @@ def get_all_payees() -> list:
     """
     try:
         payees = db.get_all_payees()
+        # Statistics for all payees in one grouped query, not two queries per payee
+        usage_stats = db.get_payee_usage_stats()
         result = []
 
         for payee in payees:
-            count = db.payee_transaction_count(payee.id)
-            last_used = db.payee_last_used_date(payee.id)
+            count, last_used = usage_stats.get(payee.id, (0, None))
 
             result.append({
                 'id': payee.id,
@@ -681,13 +681,13 @@ def get_budget_data_for_year(year: int) -> dict:
         logger.debug(f"[BUDGET_DATA] Get budget entries took {(time.time()-t2)*1000:.2f}ms")
         budget_dict = {}
         for entry in budget_entries:
-            cat_id = entry.category_id if isinstance(entry.category_id, str) else entry.category_id.id
+            cat_id = entry['category_id']
             if cat_id not in budget_dict:
                 budget_dict[cat_id] = {}
-            budget_dict[cat_id][entry.month] = {
-                'amount': entry.amount,
-                'id': entry.id,
-                'comment': entry.comment
+            budget_dict[cat_id][entry['month']] = {
+                'amount': entry['amount'],
+                'id': entry['id'],
+                'comment': entry['comment']
             }
 
         # Get transactions - organized by category and month (nested structure)
@@ -696,20 +696,20 @@ def get_budget_data_for_year(year: int) -> dict:
         logger.debug(f"[BUDGET_DATA] Get transactions took {(time.time()-t3)*1000:.2f}ms")
         transactions_dict = {}
         for t in transactions:
-            month = t.date.month
-            cat_id = t.category_id if isinstance(t.category_id, str) else t.category_id.id
+            month = t['date'].month
+            cat_id = t['category_id']
             if cat_id not in transactions_dict:
                 transactions_dict[cat_id] = {}
             if month not in transactions_dict[cat_id]:
                 transactions_dict[cat_id][month] = []
             transactions_dict[cat_id][month].append({
-                'id': t.id,
+                'id': t['id'],
                 'category_id': cat_id,
-                'payee_id': t.payee_id.id if t.payee_id else None,
-                'payee_name': t.payee_id.name if t.payee_id else None,
-                'date': str(t.date),
-                'amount': t.amount,
-                'comment': t.comment
+                'payee_id': t['payee_id'],
+                'payee_name': t['payee_name'],
+                'date': str(t['date']),
+                'amount': t['amount'],
+                'comment': t['comment']
             })
 
         total_time = (time.time() - start_time) * 1000
@@ -1457,6 +1457,34 @@ def _is_cache_valid() -> bool:
     return elapsed < CACHE_TIMEOUT
 
 
+def _get_cached_configuration() -> dict:
+    """
+    Return the configuration cache, reloading it from the database when expired.
+
+    Callers must not mutate the returned dict. An empty configuration is cached
+    as well, so a fresh install doesn't query on every lookup.
+    """
+    global _config_cache, _cache_timestamp
+
+    # Check cache first
+    if _is_cache_valid():
+        logger.debug("Returning cached configuration")
+        return _config_cache
+
+    # Cache miss or expired - load from database
+    configs = db.get_all_configuration()
+    result = {}
+    for config in configs:
+        result[config.key] = config.value
+
+    # Update cache
+    _config_cache = result
+    _cache_timestamp = datetime.now()
+
+    logger.info(f"Retrieved {len(result)} configuration settings (cache updated)")
+    return _config_cache
+
+
 def get_all_configuration() -> dict:
     """
     Get all configuration as key-value dict.
@@ -1468,26 +1496,8 @@ def get_all_configuration() -> dict:
     - Convert to dict {key: value}
     - Return config dict
     """
-    global _config_cache, _cache_timestamp
-
     try:
-        # Check cache first
-        if _is_cache_valid() and _config_cache:
-            logger.debug("Returning cached configuration")
-            return _config_cache.copy()
-
-        # Cache miss or expired - load from database
-        configs = db.get_all_configuration()
-        result = {}
-        for config in configs:
-            result[config.key] = config.value
-
-        # Update cache
-        _config_cache = result.copy()
-        _cache_timestamp = datetime.now()
-
-        logger.info(f"Retrieved {len(result)} configuration settings (cache updated)")
-        return result
+        return _get_cached_configuration().copy()
     except Exception as e:
         logger.error(f"Failed to get configuration: {e}")
         raise
@@ -1497,6 +1507,8 @@ def get_configuration_value(key: str) -> str:
     """
     Get a single configuration value by key.
 
+    Reads the cache directly (no copy of the whole configuration per lookup).
+
     Args:
         key: Configuration key to retrieve
 
@@ -1504,8 +1516,7 @@ def get_configuration_value(key: str) -> str:
         Configuration value as string, or None if not found
     """
     try:
-        config = get_all_configuration()
-        return config.get(key)
+        return _get_cached_configuration().get(key)
     except Exception as e:
         logger.error(f"Failed to get configuration value for key '{key}': {e}")
         raise
@@ -10,9 +10,10 @@ See DATABASE_DESIGN.md for complete documentation.
 
 import logging
 import time
-from peewee import MySQLDatabase, IntegrityError, DoesNotExist, OperationalError, JOIN
+from peewee import MySQLDatabase, IntegrityError, DoesNotExist, OperationalError, JOIN, chunked, fn
 from playhouse.pool import PooledMySQLDatabase
 from datetime import date, datetime
+from utils import get_month_date_range, get_year_date_range
 from database_model import (
     database,
     ALL_MODELS,
@@ -34,6 +35,9 @@ RETRY_DELAY = 1  # seconds
 ENABLE_QUERY_METRICS = True  # Set to False in production for performance
 SLOW_QUERY_THRESHOLD = 1.0  # Log queries taking longer than 1 second
 
+# Bulk insert configuration
+BULK_INSERT_BATCH_SIZE = 100  # Rows per multi-row INSERT statement
+
 
 # ==================== INITIALIZATION ====================
 
@@ -42,7 +46,8 @@ def initialize_connection(host: str = "localhost", port: int = 3306,
                          user: str = "moneybags_user",
                          password: str = "moneybags_pass",
                          pool_size: int = 10,
-                         pool_recycle: int = 3600) -> None:
+                         pool_recycle: int = 3600,
+                         client_flag: int = 0) -> None:
     """
     Initialize database connection with connection pooling.
 
@@ -57,6 +62,8 @@ def initialize_connection(host: str = "localhost", port: int = 3306,
         password: Database password
         pool_size: Maximum number of connections in pool (default: 10)
         pool_recycle: Recycle connections after this many seconds (default: 3600)
+        client_flag: Extra pymysql client flags (default: 0). Production leaves
+            this unset; tests pass CLIENT.MULTI_STATEMENTS to batch cleanup SQL.
     """
     try:
         # Initialize the PooledMySQLDatabase instance with connection parameters
@@ -69,7 +76,8 @@ def initialize_connection(host: str = "localhost", port: int = 3306,
             charset='utf8mb4',
             max_connections=pool_size,
             stale_timeout=pool_recycle,
-            timeout=10  # Connection timeout
+            timeout=10,  # Connection timeout
+            client_flag=client_flag
         )
 
         # IMPORTANT: Do NOT manually call database.connect() with PooledMySQLDatabase
@@ -323,6 +331,13 @@ def get_category_by_id(category_id: str) -> Category:
         return None
 
 
+@with_retry
+def get_categories_by_ids(category_ids) -> dict:
+    """Get categories for the given IDs in one query, as {category_id: Category}."""
+    return {category.id: category
+            for category in Category.select().where(Category.id.in_(list(category_ids)))}
+
+
 @with_retry
 def get_all_categories() -> list:
     """Get all categories."""
@@ -440,14 +455,21 @@ def payee_transaction_count(payee_id: str) -> int:
 
 
 @with_retry
-def payee_last_used_date(payee_id: str) -> str:
-    """Get most recent transaction date for payee."""
-    result = (Transaction
-              .select(Transaction.date)
-              .where(Transaction.payee_id == payee_id)
-              .order_by(Transaction.date.desc())
-              .first())
-    return result.date if result else None
+def get_payee_usage_stats() -> dict:
+    """
+    Get transaction count and most recent transaction date for every payee in one query.
+
+    Returns {payee_id: (transaction_count, last_used_date)}; payees without
+    transactions are not included.
+    """
+    return {payee_id: (count, last_used)
+            for payee_id, count, last_used in (Transaction
+                                               .select(Transaction.payee_id,
+                                                       fn.COUNT(Transaction.id),
+                                                       fn.MAX(Transaction.date))
+                                               .where(Transaction.payee_id.is_null(False))
+                                               .group_by(Transaction.payee_id)
+                                               .tuples())}
 
 
 @with_retry
@@ -515,6 +537,14 @@ def get_distinct_years() -> list:
     return [y.year for y in years]
 
 
+@with_retry
+def get_budget_template_keys() -> set:
+    """Get (category_id, year) of every budget template entry in one query."""
+    return set(BudgetTemplate
+               .select(BudgetTemplate.category_id, BudgetTemplate.year)
+               .tuples())
+
+
 # ==================== BUDGET ENTRY CRUD ====================
 
 @with_transaction
@@ -550,11 +580,25 @@ def get_budget_entry_by_id(entry_id: str) -> BudgetEntry:
 
 @with_retry
 def get_budget_entries_by_year(year: int) -> list:
-    """Get all budget entries for year (with eager-loaded categories to avoid N+1 queries)."""
+    """
+    Get all budget entries for year as plain dicts (read-only, no model instances).
+
+    Keys: id, category_id, month, amount, comment
+    """
     return list(BudgetEntry
-                .select(BudgetEntry, Category)
-                .join(Category, JOIN.LEFT_OUTER, on=(BudgetEntry.category_id == Category.id))
-                .where(BudgetEntry.year == year))
+                .select(BudgetEntry.id, BudgetEntry.category_id, BudgetEntry.month,
+                        BudgetEntry.amount, BudgetEntry.comment)
+                .where(BudgetEntry.year == year)
+                .dicts())
+
+
+@with_retry
+def get_budget_entry_keys_by_year(year: int) -> set:
+    """Get (category_id, month) of every budget entry for year in one query."""
+    return set(BudgetEntry
+               .select(BudgetEntry.category_id, BudgetEntry.month)
+               .where(BudgetEntry.year == year)
+               .tuples())
 
 
 @with_retry
@@ -631,6 +675,84 @@ def create_or_update_budget_entry(data: dict) -> BudgetEntry:
         return entry
 
 
+@with_transaction
+def bulk_create_or_update_budget_entries(rows: list) -> int:
+    """
+    Create or update many budget entries in a single transaction.
+
+    See _bulk_upsert_budget_entries() for semantics.
+
+    Args:
+        rows: List of budget entry data dicts with all fields
+
+    Returns:
+        Number of rows processed
+    """
+    return _bulk_upsert_budget_entries(rows)
+
+
+def _bulk_upsert_budget_entries(rows: list) -> int:
+    """
+    Create or update many budget entries (caller provides the transaction).
+
+    Same semantics as calling create_or_update_budget_entry() for each row:
+    entries matched by (category_id, year, month) get amount, comment and
+    updated_at overwritten (later rows win), other rows are created.
+
+    Existing entries are looked up with one query, new entries are written
+    with multi-row INSERTs instead of one round-trip per row.
+
+    Args:
+        rows: List of budget entry data dicts with all fields
+
+    Returns:
+        Number of rows processed
+    """
+    if not rows:
+        return 0
+
+    category_ids = {row["category_id"] for row in rows}
+    years = {row["year"] for row in rows}
+    existing_ids = {
+        (category_id, year, month): entry_id
+        for entry_id, category_id, year, month in (BudgetEntry
+            .select(BudgetEntry.id, BudgetEntry.category_id, BudgetEntry.year, BudgetEntry.month)
+            .where(
+                (BudgetEntry.category_id.in_(list(category_ids))) &
+                (BudgetEntry.year.in_(list(years)))
+            )
+            .tuples())
+    }
+
+    updates = {}
+    inserts = {}
+    for row in rows:
+        key = (row["category_id"], row["year"], row["month"])
+        if key in existing_ids:
+            updates[existing_ids[key]] = row
+        elif key in inserts:
+            # Duplicate within batch - update the pending insert instead
+            inserts[key].update(
+                amount=row["amount"],
+                comment=row["comment"],
+                updated_at=row["updated_at"]
+            )
+        else:
+            inserts[key] = dict(row)
+
+    for entry_id, row in updates.items():
+        (BudgetEntry
+         .update(amount=row["amount"], comment=row["comment"], updated_at=row["updated_at"])
+         .where(BudgetEntry.id == entry_id)
+         .execute())
+
+    for batch in chunked(list(inserts.values()), BULK_INSERT_BATCH_SIZE):
+        BudgetEntry.insert_many(batch).execute()
+
+    logger.info(f"Bulk saved budget entries: {len(inserts)} created, {len(updates)} updated")
+    return len(rows)
+
+
 # ==================== TRANSACTION CRUD ====================
 
 @with_transaction
@@ -654,11 +776,7 @@ def get_transaction_by_id(transaction_id: str) -> Transaction:
 @with_retry
 def get_transactions_by_category_month(category_id: str, year: int, month: int) -> list:
     """Get transactions for category/year/month."""
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1)
-    else:
-        end_date = date(year, month + 1, 1)
+    start_date, end_date = get_month_date_range(year, month)
 
     return list(Transaction
                 .select(Transaction, Payee)
@@ -673,20 +791,25 @@ def get_transactions_by_category_month(category_id: str, year: int, month: int)
 
 @with_retry
 def get_transactions_by_year(year: int) -> list:
-    """Get all transactions for year (with eager-loaded payees and categories to avoid N+1 queries)."""
-    start_date = date(year, 1, 1)
-    end_date = date(year + 1, 1, 1)
+    """
+    Get all transactions for year as plain dicts (read-only, no model instances).
+
+    Payee name is joined in the same query to avoid N+1 queries.
+    Keys: id, category_id, payee_id, payee_name, date, amount, comment
+    """
+    start_date, end_date = get_year_date_range(year)
 
     return list(Transaction
-                .select(Transaction, Payee, Category)
+                .select(Transaction.id, Transaction.category_id, Transaction.payee_id,
+                        Payee.name.alias('payee_name'), Transaction.date,
+                        Transaction.amount, Transaction.comment)
                 .join(Payee, JOIN.LEFT_OUTER, on=(Transaction.payee_id == Payee.id))
-                .switch(Transaction)
-                .join(Category, JOIN.LEFT_OUTER, on=(Transaction.category_id == Category.id))
                 .where(
                     (Transaction.date >= start_date) &
                     (Transaction.date < end_date)
                 )
-                .order_by(Transaction.date))
+                .order_by(Transaction.date)
+                .dicts())
 
 
 @with_transaction
@@ -711,8 +834,7 @@ def delete_transaction(transaction_id: str) -> None:
 @with_retry
 def category_has_transactions_for_year(category_id: str, year: int) -> bool:
     """Check if category has transactions for specific year."""
-    start_date = date(year, 1, 1)
-    end_date = date(year + 1, 1, 1)
+    start_date, end_date = get_year_date_range(year)
 
     return Transaction.select().where(
         (Transaction.category_id == category_id) &
@@ -721,6 +843,19 @@ def category_has_transactions_for_year(category_id: str, year: int) -> bool:
     ).exists()
 
 
+@with_retry
+def get_category_years_with_data() -> set:
+    """
+    Get (category_id, year) pairs that have budget entries or transactions.
+
+    One UNION query instead of per-category, per-year existence checks.
+    """
+    budget_years = BudgetEntry.select(BudgetEntry.category_id, BudgetEntry.year)
+    transaction_years = Transaction.select(Transaction.category_id, Transaction.date.year)
+    # UNION (not UNION ALL) removes duplicate pairs in the database
+    return set((budget_years | transaction_years).tuples())
+
+
 @with_retry
 def get_recent_transactions(limit: int = 5) -> list:
     """Get most recent transactions (with eager-loaded payees and categories to avoid N+1 queries)."""
@@ -772,14 +907,9 @@ def get_expense_category_totals(year: int, month: int = None) -> list:
 
     # Build date range
     if month:
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1)
-        else:
-            end_date = date(year, month + 1, 1)
+        start_date, end_date = get_month_date_range(year, month)
     else:
-        start_date = date(year, 1, 1)
-        end_date = date(year + 1, 1, 1)
+        start_date, end_date = get_year_date_range(year)
 
     # Query with aggregation - use .dicts() to get results as dictionaries
     # Convert to list immediately to release the database connection
@@ -813,6 +943,40 @@ def get_expense_category_totals(year: int, month: int = None) -> list:
     return result_list
 
 
+# ==================== IMPORT ====================
+
+@with_transaction
+def import_budget_data(budget_rows: list, transaction_rows: list, template_rows: list) -> tuple:
+    """
+    Write a whole Excel import in one transaction.
+
+    Budget entries are created or updated (see _bulk_upsert_budget_entries()),
+    transactions and budget templates are inserted with multi-row INSERTs.
+    If any write fails, nothing from the import is committed.
+
+    Args:
+        budget_rows: List of budget entry data dicts with all fields
+        transaction_rows: List of transaction data dicts with all fields
+        template_rows: List of budget template data dicts with all fields
+
+    Returns:
+        (budget_count, transaction_count, template_count)
+    """
+    budget_count = _bulk_upsert_budget_entries(budget_rows)
+
+    for batch in chunked(transaction_rows, BULK_INSERT_BATCH_SIZE):
+        Transaction.insert_many(batch).execute()
+
+    for batch in chunked(template_rows, BULK_INSERT_BATCH_SIZE):
+        BudgetTemplate.insert_many(batch).execute()
+
+    logger.info(
+        f"Imported {budget_count} budget entries, {len(transaction_rows)} transactions "
+        f"and {len(template_rows)} budget templates"
+    )
+    return budget_count, len(transaction_rows), len(template_rows)
+
+
 # ==================== CONFIGURATION CRUD ====================
 
 @with_transaction
@@ -163,6 +163,7 @@ class Transaction(BaseModel):
         table_name = 'moneybags_transactions'
         indexes = (
             # Note: category_id and payee_id indexes are automatically created by ForeignKeyField
+            (('category_id', 'date'), False),  # Composite index for category/month queries
             (('date',), False),  # Index for date-based queries
         )
 
@@ -233,6 +234,7 @@ class Supersaver(BaseModel):
         table_name = 'moneybags_supersaver'
         indexes = (
             (('category_id', 'date'), False),  # Composite index for monthly queries
+            (('date',), False),  # Index for year/dashboard queries across all categories
         )
 
 
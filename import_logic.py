@@ -10,20 +10,51 @@ This module follows the same architectural pattern as business_logic.py:
 - NO direct database calls - always use database_manager module
 - UUIDs generated via utils.generate_uid()
 - Timestamps set here (not in database)
-- Empty strings converted to NULL via utils.empty_to_none()
+- Imported rows have no comments, so comment columns are written as NULL
 """
 
 import logging
+import re
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union, BinaryIO
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 
-from utils import generate_uid, empty_to_none, validate_month, validate_year
+from utils import generate_uid, generate_uids, validate_month, validate_year
 import database_manager as db
 
 logger = logging.getLogger(__name__)
 
+# Formula validation tokens (module-level so they are built once, not per cell)
+COMPLEX_FORMULA_FUNCTIONS = ("IF", "SUM", "AVERAGE", "COUNT", "MIN", "MAX")
+UNSUPPORTED_OPERATORS = ("*", "/")
+# Amount terms: digits with an optional decimal part (no sign, exponent or "_")
+PLAIN_NUMBER_PATTERN = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+
+# Rows read from a sheet - all parsers look for categories within this range
+# (category rows up to 99, plus the budget/actual rows below them)
+SHEET_ROW_LIMIT = 101
+
+# Month column mappings per format: (column index, column letter, month).
+# Built once at import so parsers don't convert column index/letter per cell.
+# Hovedark format: F=January ... Q=December
+HOVEDARK_MONTH_COLUMNS = tuple(
+    (col_idx, get_column_letter(col_idx), month)
+    for month, col_idx in enumerate(range(6, 18), start=1)
+)
+# Original format: C=January ... N=December
+ORIGINAL_MONTH_COLUMNS = tuple(
+    (col_idx, get_column_letter(col_idx), month)
+    for month, col_idx in enumerate(range(3, 15), start=1)
+)
+# Columns read from a sheet - the widest column any parser looks at (Q).
+# Passed to iter_rows() explicitly: read-only mode otherwise trusts the
+# sheet's <dimension> tag, which some writers leave stale or too narrow.
+SHEET_COLUMN_LIMIT = max(
+    HOVEDARK_MONTH_COLUMNS[-1][0], ORIGINAL_MONTH_COLUMNS[-1][0]
+)
+
 
 # ==================== HELPER FUNCTIONS ====================
 
@@ -31,7 +62,17 @@ def _extract_amounts_from_formula(cell_value, row_num: int, col_name: str) -> li
     """
     Extract individual amounts from Excel formula or value.
 
-    Strict validation - only simple addition formulas allowed.
+    Accepted:
+    - An optional leading "=".
+    - Terms joined by "+". Empty terms are skipped.
+    - Parentheses for grouping only. They must be balanced and are removed
+      before splitting.
+    - Each term is a plain non-negative number: digits, optionally followed
+      by "." and more digits. Decimals are truncated to int.
+
+    Rejected: functions (IF, SUM, AVERAGE, COUNT, MIN, MAX), "*" and "/",
+    unbalanced parentheses, other number syntax ("1e3", "1_000", "inf"),
+    and negative terms (including "-0").
 
     Args:
         cell_value: Cell value (formula string or number)
@@ -56,63 +97,90 @@ def _extract_amounts_from_formula(cell_value, row_num: int, col_name: str) -> li
     if cell_value is None or cell_value == "":
         return []
 
-    # Convert to string
-    formula_str = str(cell_value).strip()
+    # Parsing depends only on the cell text, so identical cells (common across
+    # months and rows) are parsed once. Cell location is added on error here,
+    # outside the cache, so messages still point at the offending cell.
+    try:
+        return list(_parse_formula(str(cell_value).strip()))
+    except ValueError as e:
+        raise ValueError(f"Row {row_num}, Column {col_name}: {e}")
+
+
+@lru_cache(maxsize=4096)
+def _parse_formula(formula_str: str) -> tuple[int, ...]:
+    """
+    Parse a stripped cell string into its amounts (cached).
+
+    See _extract_amounts_from_formula for the accepted grammar. Returns a
+    tuple so cached results can't be mutated by callers.
 
+    Raises:
+        ValueError: On invalid formula format or negative values (without
+            row/column context - the caller adds it)
+    """
     # Empty after strip
     if not formula_str:
-        return []
+        return ()
 
     # Remove "=" prefix if present
     if formula_str.startswith("="):
         formula_str = formula_str[1:]
 
-    # Remove all parentheses (they're just grouping for addition, which is allowed)
+    # Parentheses are only grouping for addition - check they balance, then drop them
+    depth = 0
+    for char in formula_str:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                break
+    if depth != 0:
+        raise ValueError("Unbalanced parentheses")
     formula_str = formula_str.replace("(", "").replace(")", "")
 
-    # Check for forbidden operations/functions
-    forbidden = ["IF", "SUM", "AVERAGE", "COUNT", "MIN", "MAX", "*", "/", "-"]
-    for forbidden_item in forbidden:
-        if forbidden_item in formula_str:
-            if forbidden_item in ["IF", "SUM", "AVERAGE", "COUNT", "MIN", "MAX"]:
-                raise ValueError(f"Row {row_num}, Column {col_name}: Complex formula not supported ({forbidden_item})")
-            elif forbidden_item == "-":
-                # Allow negative check after splitting
-                pass
-            else:
-                raise ValueError(f"Row {row_num}, Column {col_name}: Only addition (+) supported")
-
-    # Split by "+"
-    parts = formula_str.split("+")
-
-    # Convert to integers
+    # Check for forbidden functions/operations
+    # ("-" is not checked here - negative values are rejected after splitting)
+    for function_name in COMPLEX_FORMULA_FUNCTIONS:
+        if function_name in formula_str:
+            raise ValueError(f"Complex formula not supported ({function_name})")
+    for operator in UNSUPPORTED_OPERATORS:
+        if operator in formula_str:
+            raise ValueError("Only addition (+) supported")
+
+    # Split by "+" and convert each term in a single pass
     amounts = []
-    for part in parts:
+    for part in formula_str.split("+"):
         part = part.strip()
         if not part:
             continue
 
-        try:
-            # Convert to float first (handles decimals), then to int
-            value = int(float(part))
+        # Plain digits (the common case) convert directly without float parsing
+        if part.isdecimal():
+            amounts.append(int(part))
+            continue
+
+        # Reject negative values by sign, before truncation ("-0.5" and "-0" included)
+        if part.startswith("-"):
+            raise ValueError(f"Negative value not allowed ({part})")
 
-            # Reject negative values
-            if value < 0:
-                raise ValueError(f"Row {row_num}, Column {col_name}: Negative value not allowed ({value})")
+        if not PLAIN_NUMBER_PATTERN.fullmatch(part):
+            raise ValueError(f"Invalid number format: {part}")
 
-            amounts.append(value)
-        except ValueError as e:
-            if "Negative value not allowed" in str(e):
-                raise
-            raise ValueError(f"Row {row_num}, Column {col_name}: Invalid number format: {part}")
+        # Decimals are truncated
+        amounts.append(int(float(part)))
 
-    return amounts
+    return tuple(amounts)
 
 
 def _ensure_import_payee() -> str:
     """
     Get or create "Import - Google Sheets" payee.
 
+    Called once per import (not per transaction), so the lookup costs a
+    single query. The ID is deliberately not cached across imports: the
+    payee can be renamed or deleted via the payee API between imports.
+
     Returns:
         str: Payee UUID
     """
@@ -131,9 +199,43 @@ def _ensure_import_payee() -> str:
     return payee.id
 
 
+def _read_sheet_rows(sheet) -> list:
+    """
+    Read rows 1..SHEET_ROW_LIMIT of a worksheet in one sequential pass.
+
+    Read-only worksheets stream cells from the file, so random access via
+    sheet.cell() would re-scan the sheet XML. Parsers index into the rows
+    returned here instead (see _cell_value()).
+
+    values_only=True yields plain values (formula strings stay intact with
+    data_only=False) without constructing a cell object per cell.
+
+    max_col is explicit so a wrong <dimension> tag can't truncate rows
+    before the month columns.
+    """
+    return list(sheet.iter_rows(
+        min_row=1, max_row=SHEET_ROW_LIMIT, max_col=SHEET_COLUMN_LIMIT, values_only=True
+    ))
+
+
+def _cell_value(rows: list, row_idx: int, col_idx: int):
+    """
+    Get cell value by 1-based row and column index from _read_sheet_rows() output.
+
+    Returns None for cells outside the read range (read-only rows are not
+    padded beyond the last populated column).
+    """
+    if row_idx > len(rows):
+        return None
+    row = rows[row_idx - 1]
+    if col_idx > len(row):
+        return None
+    return row[col_idx - 1]
+
+
 # ==================== EXCEL PARSING ====================
 
-def parse_excel_file(file_path: str, year: int) -> dict:
+def parse_excel_file(file_path: Union[str, BinaryIO], year: int) -> dict:
     """
     Parse Google Sheets Excel file and extract budget/actual data.
 
@@ -154,7 +256,7 @@ def parse_excel_file(file_path: str, year: int) -> dict:
     - Skip rows: N+2, N+3 (computed)
 
     Args:
-        file_path: Path to .xlsx file
+        file_path: Path to .xlsx file, or a binary file-like object
         year: Year for the data
 
     Returns:
@@ -177,34 +279,30 @@ def parse_excel_file(file_path: str, year: int) -> dict:
     if not validate_year(year):
         raise ValueError(f"Invalid year: {year}")
 
-    # Load workbook
+    # Load workbook (read-only streams the sheet instead of materializing it;
+    # data_only=False keeps formula strings for _extract_amounts_from_formula)
     try:
-        wb = load_workbook(file_path, data_only=False)
+        wb = load_workbook(file_path, read_only=True, data_only=False, keep_links=False)
     except Exception as e:
         raise ValueError(f"Failed to load Excel file: {e}")
 
-    # Detect format by checking structure
-    # New format has: category name in Col C, "Budsjett" in Col D
-    # Old format has: category name in Col B, "Budsjett" in next row Col B
-    if "Hovedark" in wb.sheetnames:
-        sheet = wb["Hovedark"]
-        # Check if new format: scan for a row with "Budsjett" in Col D
-        is_new_format = False
-        for row_idx in range(1, 100):
-            col_d_value = sheet.cell(row_idx, 4).value
-            if col_d_value == "Budsjett":
-                is_new_format = True
-                break
-
-        if is_new_format:
-            return _parse_hovedark_format(wb, year)
-        else:
-            return _parse_original_format(wb, year)
-    else:
-        return _parse_original_format(wb, year)
-
-
-def _parse_hovedark_format(wb, year: int) -> dict:
+    try:
+        # Detect format by checking structure
+        # New format has: category name in Col C, "Budsjett" in Col D
+        # Old format has: category name in Col B, "Budsjett" in next row Col B
+        if "Hovedark" in wb.sheetnames:
+            rows = _read_sheet_rows(wb["Hovedark"])
+            # Check if new format: scan for a row with "Budsjett" in Col D
+            for row_idx in range(1, 100):
+                if _cell_value(rows, row_idx, 4) == "Budsjett":
+                    return _parse_hovedark_format(rows, year)
+
+        return _parse_original_format(_read_sheet_rows(wb.active), year)
+    finally:
+        wb.close()
+
+
+def _parse_hovedark_format(rows: list, year: int) -> dict:
     """
     Parse Hovedark Excel format.
 
@@ -217,31 +315,17 @@ def _parse_hovedark_format(wb, year: int) -> dict:
     - Row N+2, N+3: Computed rows (skip)
     - Sections: "Utgifter" (expenses) and "Inntekter" (income)
     - Skip categories with "Total" in name
-    """
-    sheet = wb["Hovedark"]
-
-    # Month column mapping for Hovedark format (F=1, G=2, ..., Q=12)
-    month_columns = {
-        6: 1,   # F = January
-        7: 2,   # G = February
-        8: 3,   # H = March
-        9: 4,   # I = April
-        10: 5,  # J = May
-        11: 6,  # K = June
-        12: 7,  # L = July
-        13: 8,  # M = August
-        14: 9,  # N = September
-        15: 10, # O = October
-        16: 11, # P = November
-        17: 12  # Q = December
-    }
 
+    Args:
+        rows: Rows of the "Hovedark" sheet from _read_sheet_rows()
+        year: Year for the data
+    """
     # Find section boundaries
     utgifter_row = None
     inntekter_row = None
 
     for row_idx in range(1, 100):
-        cell_c = sheet.cell(row_idx, 3).value  # Column C
+        cell_c = _cell_value(rows, row_idx, 3)  # Column C
         if cell_c:
             if "Utgifter" in str(cell_c):
                 utgifter_row = row_idx
@@ -259,8 +343,8 @@ def _parse_hovedark_format(wb, year: int) -> dict:
 
     # Scan all rows looking for categories (where Col D = "Budsjett")
     for row_idx in range(1, 100):
-        col_c = sheet.cell(row_idx, 3).value  # Category name
-        col_d = sheet.cell(row_idx, 4).value  # Should be "Budsjett"
+        col_c = _cell_value(rows, row_idx, 3)  # Category name
+        col_d = _cell_value(rows, row_idx, 4)  # Should be "Budsjett"
 
         # A category row has a name in Col C and "Budsjett" in Col D
         if not col_c or col_d != "Budsjett":
@@ -285,13 +369,12 @@ def _parse_hovedark_format(wb, year: int) -> dict:
 
         # Extract budget values from this row (cols F-Q)
         budget = {}
-        for col_idx, month in month_columns.items():
-            cell = sheet.cell(row_idx, col_idx)
-            if cell.value:
+        for col_idx, col_letter, month in HOVEDARK_MONTH_COLUMNS:
+            value = _cell_value(rows, row_idx, col_idx)
+            if value:
                 try:
                     # Budget cells can be formulas (e.g., =1000+5200) or plain numbers
-                    col_letter = get_column_letter(col_idx)
-                    amounts = _extract_amounts_from_formula(cell.value, row_idx, col_letter)
+                    amounts = _extract_amounts_from_formula(value, row_idx, col_letter)
                     if amounts:
                         # Sum all amounts for budget total
                         amount = sum(amounts)
@@ -304,12 +387,11 @@ def _parse_hovedark_format(wb, year: int) -> dict:
         # Extract actual values from row N+1 (cols F-Q)
         actuals = {}
         actuals_row = row_idx + 1
-        for col_idx, month in month_columns.items():
-            cell = sheet.cell(actuals_row, col_idx)
-            if cell.value:
+        for col_idx, col_letter, month in HOVEDARK_MONTH_COLUMNS:
+            value = _cell_value(rows, actuals_row, col_idx)
+            if value:
                 try:
-                    col_letter = get_column_letter(col_idx)
-                    amounts = _extract_amounts_from_formula(cell.value, actuals_row, col_letter)
+                    amounts = _extract_amounts_from_formula(value, actuals_row, col_letter)
                     if amounts:
                         actuals[month] = amounts
                 except ValueError as e:
@@ -338,21 +420,19 @@ def _parse_hovedark_format(wb, year: int) -> dict:
     }
 
 
-def _parse_original_format(wb, year: int) -> dict:
-    """Parse original Excel format (active sheet with columns C-N)."""
-    sheet = wb.active
-
-    # Month column mapping (C=1, D=2, ..., N=12)
-    month_columns = {
-        'C': 1, 'D': 2, 'E': 3, 'F': 4, 'G': 5, 'H': 6,
-        'I': 7, 'J': 8, 'K': 9, 'L': 10, 'M': 11, 'N': 12
-    }
+def _parse_original_format(rows: list, year: int) -> dict:
+    """
+    Parse original Excel format (active sheet with columns C-N).
 
+    Args:
+        rows: Rows of the active sheet from _read_sheet_rows()
+        year: Year for the data
+    """
     # Find "Utgifter" row to split income vs expenses
     utgifter_row = None
     for row_idx in range(1, 100):
-        cell = sheet[f'B{row_idx}']
-        if cell.value and "Utgifter" in str(cell.value):
+        cell_b = _cell_value(rows, row_idx, 2)  # Column B
+        if cell_b and "Utgifter" in str(cell_b):
             utgifter_row = row_idx
             break
 
@@ -364,8 +444,7 @@ def _parse_original_format(wb, year: int) -> dict:
     # Parse income categories (4-row pattern: Category, Budsjett, Resultat, Differanse)
     # Start at row 8, step by 4, until we reach utgifter_row
     for row_idx in range(8, utgifter_row, 4):
-        category_cell = sheet[f'B{row_idx}']
-        category_name = category_cell.value
+        category_name = _cell_value(rows, row_idx, 2)  # Column B
 
         # Skip if no category name or if it's a header row or row label
         if not category_name or category_name in ["Inntekter", "Utgifter", "Balanse", "Budsjett", "Resultat", "Differanse"]:
@@ -377,12 +456,12 @@ def _parse_original_format(wb, year: int) -> dict:
         # Extract budget values (row N+1)
         budget = {}
         budget_row = row_idx + 1
-        for col, month in month_columns.items():
-            cell = sheet[f'{col}{budget_row}']
-            if cell.value:
+        for col_idx, col, month in ORIGINAL_MONTH_COLUMNS:
+            value = _cell_value(rows, budget_row, col_idx)
+            if value:
                 try:
                     # Budget cells can be formulas (e.g., =1000+5200) or plain numbers
-                    amounts = _extract_amounts_from_formula(cell.value, budget_row, col)
+                    amounts = _extract_amounts_from_formula(value, budget_row, col)
                     if amounts:
                         budget[month] = sum(amounts)  # Sum for total budget
                 except (ValueError, TypeError):
@@ -392,11 +471,11 @@ def _parse_original_format(wb, year: int) -> dict:
         # Extract actual values (row N+2)
         actuals = {}
         actuals_row = row_idx + 2
-        for col, month in month_columns.items():
-            cell = sheet[f'{col}{actuals_row}']
-            if cell.value:
+        for col_idx, col, month in ORIGINAL_MONTH_COLUMNS:
+            value = _cell_value(rows, actuals_row, col_idx)
+            if value:
                 try:
-                    amounts = _extract_amounts_from_formula(cell.value, actuals_row, col)
+                    amounts = _extract_amounts_from_formula(value, actuals_row, col)
                     if amounts:
                         actuals[month] = amounts
                 except ValueError as e:
@@ -416,8 +495,7 @@ def _parse_original_format(wb, year: int) -> dict:
     # Parse expense categories (3-row pattern: Category, Budsjett, Resultat - NO Differanse)
     # Start at utgifter_row + 1, step by 3
     for row_idx in range(utgifter_row + 1, 60, 3):
-        category_cell = sheet[f'B{row_idx}']
-        category_name = category_cell.value
+        category_name = _cell_value(rows, row_idx, 2)  # Column B
 
         # Skip if no category name or if it's a header row or row label
         if not category_name or category_name in ["Inntekter", "Utgifter", "Balanse", "Budsjett", "Resultat", "Differanse"]:
@@ -429,12 +507,12 @@ def _parse_original_format(wb, year: int) -> dict:
         # Extract budget values (row N+1)
         budget = {}
         budget_row = row_idx + 1
-        for col, month in month_columns.items():
-            cell = sheet[f'{col}{budget_row}']
-            if cell.value:
+        for col_idx, col, month in ORIGINAL_MONTH_COLUMNS:
+            value = _cell_value(rows, budget_row, col_idx)
+            if value:
                 try:
                     # Budget cells can be formulas (e.g., =1000+5200) or plain numbers
-                    amounts = _extract_amounts_from_formula(cell.value, budget_row, col)
+                    amounts = _extract_amounts_from_formula(value, budget_row, col)
                     if amounts:
                         budget[month] = sum(amounts)  # Sum for total budget
                 except (ValueError, TypeError):
@@ -444,11 +522,11 @@ def _parse_original_format(wb, year: int) -> dict:
         # Extract actual values (row N+2)
         actuals = {}
         actuals_row = row_idx + 2
-        for col, month in month_columns.items():
-            cell = sheet[f'{col}{actuals_row}']
-            if cell.value:
+        for col_idx, col, month in ORIGINAL_MONTH_COLUMNS:
+            value = _cell_value(rows, actuals_row, col_idx)
+            if value:
                 try:
-                    amounts = _extract_amounts_from_formula(cell.value, actuals_row, col)
+                    amounts = _extract_amounts_from_formula(value, actuals_row, col)
                     if amounts:
                         actuals[month] = amounts
                 except ValueError as e:
@@ -505,6 +583,11 @@ def validate_import(parsed_data: dict, category_mapping: dict) -> dict:
 
     year = parsed_data["year"]
 
+    # Fetch mapped categories and existing budget entries up front (two queries)
+    # instead of one query per category and per budget month
+    categories = db.get_categories_by_ids(set(category_mapping.values()))
+    existing_budget_keys = db.get_budget_entry_keys_by_year(year)
+
     # Validate all categories exist and types match
     for sheet_cat in parsed_data["sheet_categories"]:
         sheet_name = sheet_cat["name"]
@@ -517,7 +600,7 @@ def validate_import(parsed_data: dict, category_mapping: dict) -> dict:
         category_id = category_mapping[sheet_name]
 
         # Check category exists
-        category = db.get_category_by_id(category_id)
+        category = categories.get(category_id)
         if not category:
             errors.append(f"Category '{sheet_name}' mapped to '{category_id}' which does not exist")
             continue
@@ -530,15 +613,12 @@ def validate_import(parsed_data: dict, category_mapping: dict) -> dict:
         # Count budget entries and check for duplicates
         for month_str in sheet_cat["budget"].keys():
             month = int(month_str)  # Convert string to int
-            existing = db.get_budget_entry(category_id, year, month)
-            if existing:
+            if (category_id, month) in existing_budget_keys:
                 warnings.append(f"Budget entry for '{category.name}' {year}-{month:02d} already exists - will overwrite")
             budget_count += 1
 
         # Count transactions
-        for month_str, amounts in sheet_cat["actuals"].items():
-            month = int(month_str)  # Convert string to int
-            transaction_count += len(amounts)
+        transaction_count += sum(map(len, sheet_cat["actuals"].values()))
 
     # Final validation
     valid = len(errors) == 0
@@ -576,65 +656,76 @@ def import_budget_and_transactions(parsed_data: dict, category_mapping: dict) ->
     """
     import_payee_id = _ensure_import_payee()
 
-    budget_count = 0
-    transaction_count = 0
-
     year = parsed_data["year"]
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Generate all record IDs for budget entries and transactions in one batch
+    row_count = sum(
+        len(sheet_category["budget"]) + sum(map(len, sheet_category["actuals"].values()))
+        for sheet_category in parsed_data["sheet_categories"]
+    )
+    uids = iter(generate_uids(row_count))
+
+    # Collect all rows first, then write them with bulk inserts
+    budget_rows = []
+    transaction_rows = []
 
     for sheet_category in parsed_data["sheet_categories"]:
         category_id = category_mapping[sheet_category["name"]]
 
-        # Import budget entries
+        # Budget entries
         for month_str, amount in sheet_category["budget"].items():
             month = int(month_str)  # Convert string to int
-            data = {
-                "id": generate_uid(),
+            budget_rows.append({
+                "id": next(uids),
                 "category_id": category_id,
                 "year": year,
                 "month": month,
                 "amount": amount,
-                "comment": empty_to_none(None),
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            db.create_or_update_budget_entry(data)
-            budget_count += 1
+                "comment": None,  # Imported rows never have a comment
+                "created_at": timestamp,
+                "updated_at": timestamp
+            })
 
-        # Import transactions
+        # Transactions
         for month_str, amounts in sheet_category["actuals"].items():
             month = int(month_str)  # Convert string to int
+            date_str = f"{year}-{month:02d}-01"
             for amount in amounts:
-                date_str = f"{year}-{month:02d}-01"
-                data = {
-                    "id": generate_uid(),
+                transaction_rows.append({
+                    "id": next(uids),
                     "category_id": category_id,
                     "payee_id": import_payee_id,
                     "date": date_str,
                     "amount": amount,
-                    "comment": empty_to_none(None),
-                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                db.create_transaction(data)
-                transaction_count += 1
-
-    logger.info(f"Imported {budget_count} budget entries and {transaction_count} transactions")
-
-    # Ensure all imported categories are in the budget template for this year
-    template_count = 0
-    unique_category_ids = set(category_mapping.values())
-    for category_id in unique_category_ids:
-        # Only create if it doesn't already exist
-        if not db.budget_template_exists(year, category_id):
-            template_data = {
-                'id': generate_uid(),
-                'year': year,
-                'category_id': category_id,
-                'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            db.create_budget_template(template_data)
-            template_count += 1
-            logger.info(f"Added category {category_id} to budget template for {year}")
+                    "comment": None,
+                    "created_at": timestamp,
+                    "updated_at": timestamp
+                })
+
+    # Add imported categories missing from this year's budget template
+    existing_template_keys = db.get_budget_template_keys()  # One query, not one per category
+    template_rows = [
+        {
+            'id': generate_uid(),
+            'year': year,
+            'category_id': category_id,
+            'created_at': timestamp
+        }
+        for category_id in set(category_mapping.values())
+        if (category_id, year) not in existing_template_keys
+    ]
+
+    # Budget entries, transactions and templates are committed together -
+    # a failed insert leaves the year's existing data untouched
+    budget_count, transaction_count, template_count = db.import_budget_data(
+        budget_rows, transaction_rows, template_rows
+    )
+
+    logger.info(
+        f"Imported {budget_count} budget entries and {transaction_count} transactions, "
+        f"added {template_count} categories to budget template for {year}"
+    )
 
     return {
         "budget_count": budget_count,
@@ -0,0 +1,9 @@
+-- Migration: Add date index to supersaver entries
+-- Date: 2026-10-16
+-- Description: Adds index on moneybags_supersaver.date for year-wide and dashboard
+-- queries that filter on date across all categories (heatmap, monthly totals).
+--
+-- Only needed for databases where PeeWee created the table. Tables created by
+-- 003_add_supersaver.sql already have this index (as idx_date) - skip this migration.
+
+CREATE INDEX IF NOT EXISTS moneybags_supersaver_date ON moneybags_supersaver (date);
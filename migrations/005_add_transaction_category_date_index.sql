@@ -0,0 +1,11 @@
+-- Migration: Add composite (category_id, date) index to transactions
+-- Date: 2026-10-16
+-- Description: Category/month queries (budget cell transaction lists) filter on
+-- category_id and a date range. The separate category_id and date indexes mean
+-- MySQL picks one and filters the rest row by row; the composite index answers
+-- the query with a single range scan. Matches the existing supersaver index.
+--
+-- Index name matches what PeeWee generates for the model, so new databases
+-- created by the application already have it.
+
+CREATE INDEX IF NOT EXISTS moneybags_transactions_category_id_date ON moneybags_transactions (category_id, date);
@@ -50,14 +50,14 @@ def create_supersaver_category(name: str) -> dict:
         }
 
         category = ssdb.create_supersaver_category(category_data)
-        logger.info(f"Business logic: Created supersaver category {name}")
+        logger.info("Business logic: Created supersaver category %s", name)
 
         return {
             'id': category.id,
             'name': category.name
         }
     except Exception as e:
-        logger.error(f"Failed to create supersaver category: {e}")
+        logger.error("Failed to create supersaver category: %s", e)
         raise
 
 
@@ -80,7 +80,7 @@ def get_all_supersaver_categories() -> list:
 
         return result
     except Exception as e:
-        logger.error(f"Failed to get supersaver categories: {e}")
+        logger.error("Failed to get supersaver categories: %s", e)
         raise
 
 
@@ -112,14 +112,16 @@ def update_supersaver_category(category_id: str, name: str) -> dict:
             category_id,
             {'name': name, 'updated_at': datetime.now()}
         )
-        logger.info(f"Business logic: Updated supersaver category {category_id}")
+        if updated_category is None:
+            raise ValueError(f"Supersaver category {category_id} not found")
+        logger.info("Business logic: Updated supersaver category %s", category_id)
 
         return {
             'id': updated_category.id,
             'name': updated_category.name
         }
     except Exception as e:
-        logger.error(f"Failed to update supersaver category: {e}")
+        logger.error("Failed to update supersaver category: %s", e)
         raise
 
 
@@ -142,10 +144,11 @@ def delete_supersaver_category(category_id: str) -> None:
                 f"Cannot delete category '{category.name}' - it has supersaver entries"
             )
 
-        ssdb.delete_supersaver_category(category_id)
-        logger.info(f"Business logic: Deleted supersaver category {category_id}")
+        if not ssdb.delete_supersaver_category(category_id):
+            raise ValueError(f"Supersaver category {category_id} not found")
+        logger.info("Business logic: Deleted supersaver category %s", category_id)
     except Exception as e:
-        logger.error(f"Failed to delete supersaver category: {e}")
+        logger.error("Failed to delete supersaver category: %s", e)
         raise
 
 
@@ -195,7 +198,7 @@ def create_supersaver_entry(
         }
 
         entry = ssdb.create_supersaver_entry(entry_data)
-        logger.info(f"Business logic: Created supersaver entry {amount} to {category.name}")
+        logger.info("Business logic: Created supersaver entry %s to %s", amount, category.name)
 
         return {
             'id': entry.id,
@@ -206,7 +209,7 @@ def create_supersaver_entry(
             'comment': entry.comment
         }
     except Exception as e:
-        logger.error(f"Failed to create supersaver entry: {e}")
+        logger.error("Failed to create supersaver entry: %s", e)
         raise
 
 
@@ -217,12 +220,12 @@ def update_supersaver_entry(
     date_str: str,
     comment: Optional[str] = None
 ) -> dict:
-    """Update supersaver entry."""
-    try:
-        entry = ssdb.get_supersaver_entry_by_id(entry_id)
-        if not entry:
-            raise ValueError(f"Supersaver entry {entry_id} not found")
+    """
+    Update supersaver entry.
 
+    Entry existence is checked by the update itself (no separate lookup).
+    """
+    try:
         # Validate category
         category = ssdb.get_supersaver_category_by_id(category_id)
         if not category:
@@ -247,7 +250,9 @@ def update_supersaver_entry(
         }
 
         updated_entry = ssdb.update_supersaver_entry(entry_id, update_data)
-        logger.info(f"Business logic: Updated supersaver entry {entry_id}")
+        if updated_entry is None:
+            raise ValueError(f"Supersaver entry {entry_id} not found")
+        logger.info("Business logic: Updated supersaver entry %s", entry_id)
 
         return {
             'id': updated_entry.id,
@@ -258,21 +263,22 @@ def update_supersaver_entry(
             'comment': updated_entry.comment
         }
     except Exception as e:
-        logger.error(f"Failed to update supersaver entry: {e}")
+        logger.error("Failed to update supersaver entry: %s", e)
         raise
 
 
 def delete_supersaver_entry(entry_id: str) -> None:
-    """Delete supersaver entry."""
+    """
+    Delete supersaver entry.
+
+    Entry existence is checked by the delete itself (no separate lookup).
+    """
     try:
-        entry = ssdb.get_supersaver_entry_by_id(entry_id)
-        if not entry:
+        if not ssdb.delete_supersaver_entry(entry_id):
             raise ValueError(f"Supersaver entry {entry_id} not found")
-
-        ssdb.delete_supersaver_entry(entry_id)
-        logger.info(f"Business logic: Deleted supersaver entry {entry_id}")
+        logger.info("Business logic: Deleted supersaver entry %s", entry_id)
     except Exception as e:
-        logger.error(f"Failed to delete supersaver entry: {e}")
+        logger.error("Failed to delete supersaver entry: %s", e)
         raise
 
 
@@ -308,7 +314,7 @@ def get_supersaver_entries_for_month(
 
         return result
     except Exception as e:
-        logger.error(f"Failed to get supersaver entries for month: {e}")
+        logger.error("Failed to get supersaver entries for month: %s", e)
         raise
 
 
@@ -329,19 +335,11 @@ def get_supersaver_heatmap_year(year: int) -> dict:
     }
     """
     try:
-        # Get all entries for the year (all categories)
-        all_entries = ssdb.get_all_supersaver_entries_for_year(year)
+        # Deposits aggregated by date in the database (all categories)
+        daily_totals = ssdb.get_supersaver_daily_totals(year)
 
-        # Aggregate deposits by date
-        days = {}
-        total_saved = 0
-
-        for entry in all_entries:
-            date_str = str(entry.date)
-            if date_str not in days:
-                days[date_str] = 0
-            days[date_str] += entry.amount
-            total_saved += entry.amount
+        days = {str(day): total for day, total in daily_totals.items()}
+        total_saved = sum(daily_totals.values())
 
         return {
             'year': year,
@@ -349,7 +347,7 @@ def get_supersaver_heatmap_year(year: int) -> dict:
             'total_saved': total_saved
         }
     except Exception as e:
-        logger.error(f"Failed to get supersaver heatmap: {e}")
+        logger.error("Failed to get supersaver heatmap: %s", e)
         raise
 
 
@@ -365,18 +363,6 @@ def get_supersaver_dashboard_summary() -> dict:
         current_month = datetime.now().month
         current_year = datetime.now().year
 
-        # Get all entries for current year
-        all_entries_current_year = ssdb.get_all_supersaver_entries_for_year(current_year)
-
-        # Calculate this month savings (deposits only, no withdrawals)
-        this_month_deposits = 0
-        this_year_deposits = 0
-
-        for entry in all_entries_current_year:
-            this_year_deposits += entry.amount
-            if entry.date.month == current_month:
-                this_month_deposits += entry.amount
-
         # Calculate previous month for trend
         if current_month == 1:
             prev_month = 12
@@ -385,12 +371,19 @@ def get_supersaver_dashboard_summary() -> dict:
             prev_month = current_month - 1
             prev_year = current_year
 
-        all_entries_prev_year = ssdb.get_all_supersaver_entries_for_year(prev_year)
-        prev_month_deposits = 0
+        # One grouped query covering December of previous year through current year
+        monthly_totals = ssdb.get_supersaver_monthly_totals(
+            date(current_year - 1, 12, 1),
+            date(current_year + 1, 1, 1)
+        )
 
-        for entry in all_entries_prev_year:
-            if entry.date.month == prev_month:
-                prev_month_deposits += entry.amount
+        # Deposits only, no withdrawals
+        this_month_deposits = monthly_totals.get((current_year, current_month), 0)
+        prev_month_deposits = monthly_totals.get((prev_year, prev_month), 0)
+        this_year_deposits = sum(
+            total for (year, _), total in monthly_totals.items()
+            if year == current_year
+        )
 
         # Determine trend
         if this_month_deposits > prev_month_deposits:
@@ -406,5 +399,5 @@ def get_supersaver_dashboard_summary() -> dict:
             'month_trend': month_trend
         }
     except Exception as e:
-        logger.error(f"Failed to get supersaver dashboard summary: {e}")
+        logger.error("Failed to get supersaver dashboard summary: %s", e)
         raise
@@ -14,6 +14,7 @@ import logging
 from datetime import date
 from peewee import DoesNotExist, fn
 from database_model import SupersaverCategory, Supersaver
+from utils import get_month_date_range, get_year_date_range
 import database_manager as db
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,7 @@ def create_supersaver_category(data: dict) -> SupersaverCategory:
     """Create supersaver category with provided data dict."""
     category = SupersaverCategory(**data)
     category.save(force_insert=True)
-    logger.info(f"Created supersaver category: {category.name} ({category.id})")
+    logger.info("Created supersaver category: %s (%s)", category.name, category.id)
     return category
 
 
@@ -55,22 +56,31 @@ def supersaver_category_exists_by_name(name: str) -> bool:
 
 @db.with_transaction
 def update_supersaver_category(category_id: str, data: dict) -> SupersaverCategory:
-    """Update supersaver category fields."""
-    category = SupersaverCategory.get(SupersaverCategory.id == category_id)
-    for key, value in data.items():
-        setattr(category, key, value)
-    category.save()
-    logger.info(f"Updated supersaver category: {category.name} ({category.id})")
+    """
+    Update supersaver category fields.
+
+    Single UPDATE followed by one SELECT for the response model.
+    Returns None if category does not exist.
+    """
+    SupersaverCategory.update(**data).where(
+        SupersaverCategory.id == category_id
+    ).execute()
+    category = SupersaverCategory.get_or_none(SupersaverCategory.id == category_id)
+    if category is None:
+        return None
+    logger.info("Updated supersaver category: %s (%s)", category.name, category.id)
     return category
 
 
 @db.with_transaction
-def delete_supersaver_category(category_id: str) -> None:
-    """Delete supersaver category by ID."""
-    category = SupersaverCategory.get(SupersaverCategory.id == category_id)
-    category_name = category.name
-    category.delete_instance()
-    logger.info(f"Deleted supersaver category: {category_name} ({category_id})")
+def delete_supersaver_category(category_id: str) -> int:
+    """Delete supersaver category by ID. Returns number of rows deleted (0 if not found)."""
+    rows = SupersaverCategory.delete().where(
+        SupersaverCategory.id == category_id
+    ).execute()
+    if rows:
+        logger.info("Deleted supersaver category: %s", category_id)
+    return rows
 
 
 @db.with_retry
@@ -88,7 +98,7 @@ def create_supersaver_entry(data: dict) -> Supersaver:
     """Create supersaver entry with provided data dict."""
     entry = Supersaver(**data)
     entry.save(force_insert=True)
-    logger.info(f"Created supersaver entry: {entry.amount} ({entry.id})")
+    logger.info("Created supersaver entry: %s (%s)", entry.amount, entry.id)
     return entry
 
 
@@ -107,37 +117,46 @@ def get_supersaver_entries_by_category_month(
     year: int,
     month: int
 ) -> list:
-    """Get supersaver entries for category/year/month."""
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1)
-    else:
-        end_date = date(year, month + 1, 1)
+    """
+    Get supersaver entries for category/year/month.
+
+    Returns lightweight named tuples (attribute access, no model instances)
+    since results are only read to build API responses.
+    """
+    start_date, end_date = get_month_date_range(year, month)
 
     return list(Supersaver.select().where(
         (Supersaver.category_id == category_id) &
         (Supersaver.date >= start_date) &
         (Supersaver.date < end_date)
-    ).order_by(Supersaver.date.desc()))
+    ).order_by(Supersaver.date.desc()).namedtuples())
 
 
 @db.with_transaction
 def update_supersaver_entry(entry_id: str, data: dict) -> Supersaver:
-    """Update supersaver entry fields."""
-    entry = Supersaver.get(Supersaver.id == entry_id)
-    for key, value in data.items():
-        setattr(entry, key, value)
-    entry.save()
-    logger.info(f"Updated supersaver entry: {entry_id}")
+    """
+    Update supersaver entry fields.
+
+    Single UPDATE followed by one SELECT for the response model.
+    MySQL reports changed (not matched) rows for UPDATE, so existence is
+    determined by the SELECT rather than the affected row count.
+    Returns None if entry does not exist.
+    """
+    Supersaver.update(**data).where(Supersaver.id == entry_id).execute()
+    entry = Supersaver.get_or_none(Supersaver.id == entry_id)
+    if entry is None:
+        return None
+    logger.info("Updated supersaver entry: %s", entry_id)
     return entry
 
 
 @db.with_transaction
-def delete_supersaver_entry(entry_id: str) -> None:
-    """Delete supersaver entry by ID."""
-    entry = Supersaver.get(Supersaver.id == entry_id)
-    entry.delete_instance()
-    logger.info(f"Deleted supersaver entry: {entry_id}")
+def delete_supersaver_entry(entry_id: str) -> int:
+    """Delete supersaver entry by ID. Returns number of rows deleted (0 if not found)."""
+    rows = Supersaver.delete().where(Supersaver.id == entry_id).execute()
+    if rows:
+        logger.info("Deleted supersaver entry: %s", entry_id)
+    return rows
 
 
 @db.with_retry
@@ -164,12 +183,48 @@ def get_supersaver_balance(category_id: str) -> int:
 
 
 @db.with_retry
-def get_all_supersaver_entries_for_year(year: int) -> list:
-    """Get all supersaver entries across all categories for a given year."""
-    start_date = date(year, 1, 1)
-    end_date = date(year + 1, 1, 1)
+def get_supersaver_daily_totals(year: int) -> dict:
+    """
+    Get total deposits per day (all categories) for a given year.
 
-    return list(Supersaver.select().where(
-        (Supersaver.date >= start_date) &
-        (Supersaver.date < end_date)
-    ).order_by(Supersaver.date.desc()))
+    Returns dict keyed by date: {date(2025, 1, 15): 50000, ...}
+    Days without entries are not included.
+    """
+    start_date, end_date = get_year_date_range(year)
+
+    rows = (Supersaver
+            .select(Supersaver.date, fn.SUM(Supersaver.amount))
+            .where(
+                (Supersaver.date >= start_date) &
+                (Supersaver.date < end_date)
+            )
+            .group_by(Supersaver.date)
+            .tuples())
+
+    return {entry_date: int(total) for entry_date, total in rows}
+
+
+@db.with_retry
+def get_supersaver_monthly_totals(start_date: date, end_date: date) -> dict:
+    """
+    Get total deposits per month (all categories) within date range.
+
+    Range is half-open: start_date <= date < end_date.
+
+    Returns dict keyed by (year, month): {(2025, 1): 150000, ...}
+    Months without entries are not included.
+    """
+    # Portable date parts (EXTRACT on MySQL, strftime-based on SQLite)
+    year_col = Supersaver.date.year
+    month_col = Supersaver.date.month
+
+    rows = (Supersaver
+            .select(year_col, month_col, fn.SUM(Supersaver.amount))
+            .where(
+                (Supersaver.date >= start_date) &
+                (Supersaver.date < end_date)
+            )
+            .group_by(year_col, month_col)
+            .tuples())
+
+    return {(int(year), int(month)): int(total) for year, month, total in rows}
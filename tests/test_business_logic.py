@@ -2,162 +2,164 @@
 Tests for business_logic.py
 
 Tests for formula parsing helper function.
+
+Supersaver tests share the same fixture.
+
+Import tests only need CRUD correctness, so they run against an in-memory
+SQLite database instead of the MySQL test server.
 """
 
 import pytest
+import zipfile
+from datetime import datetime
+from io import BytesIO
+from openpyxl import Workbook
+from peewee import IntegrityError, SqliteDatabase
+from playhouse.test_utils import count_queries
 import business_logic
 import import_logic
-import pymysql
-from database_model import database, Category, Payee, BudgetEntry, BudgetTemplate, Transaction, Configuration
+import supersaver_business_logic
+from database_model import ALL_MODELS, BudgetEntry, Transaction
 import database_manager as db
 
 
-@pytest.fixture(scope="session", autouse=True)
-def create_test_database():
-    """Create test database once at session start."""
-    conn = pymysql.connect(
-        host="sandbox",
-        port=3306,
-        user="root",
-        password="devpassword"
-    )
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute("CREATE DATABASE IF NOT EXISTS moneybags_test")
-        conn.commit()
-    finally:
-        conn.close()
-
-
-@pytest.fixture(scope="function")
-def setup_test_db():
-    """Setup test database before each test, teardown after."""
-    # Initialize test database
-    db.initialize_connection(
-        host="sandbox",
-        port=3306,
-        database_name="moneybags_test",
-        user="root",
-        password="devpassword",
-        pool_size=5
-    )
-
-    # Create tables
-    db.create_tables_if_not_exist()
-
-    yield
-
-    # Cleanup - truncate all tables and close connection
-    try:
-        # Truncate tables instead of dropping them (faster and preserves schema)
-        Transaction.delete().execute()
-        BudgetEntry.delete().execute()
-        BudgetTemplate.delete().execute()
-        Payee.delete().execute()
-        Category.delete().execute()
-        Configuration.delete().execute()
-    except:
-        pass  # Ignore errors during cleanup
-    finally:
-        db.close_connection()
-
-
-def test_extract_amounts_from_formula_simple_addition():
-    """Test extracting amounts from simple addition formula."""
-    result = import_logic._extract_amounts_from_formula("=575+2182", 10, "C")
-    assert result == [575, 2182]
-
-
-def test_extract_amounts_from_formula_single_value():
-    """Test extracting single value from formula."""
-    result = import_logic._extract_amounts_from_formula("=104571", 10, "C")
-    assert result == [104571]
-
-
-def test_extract_amounts_from_formula_plain_number():
-    """Test extracting plain number (no formula)."""
-    result = import_logic._extract_amounts_from_formula("55615.0", 10, "C")
-    assert result == [55615]
-
-    result = import_logic._extract_amounts_from_formula(55615.0, 10, "C")
-    assert result == [55615]
-
-
-def test_extract_amounts_from_formula_zero():
-    """Test that zero values are included."""
-    result = import_logic._extract_amounts_from_formula("0", 10, "C")
-    assert result == [0]
-
-
-def test_extract_amounts_from_formula_empty():
-    """Test that empty cells are skipped."""
-    result = import_logic._extract_amounts_from_formula("", 10, "C")
-    assert result == []
-
-    result = import_logic._extract_amounts_from_formula(None, 10, "C")
-    assert result == []
-
-
-def test_extract_amounts_from_formula_rejects_complex():
-    """Test that complex formulas are rejected."""
-    import pytest
+# Placeholder for created_at/updated_at - tests never assert on timestamps
+FIXED_TS = "2024-01-01 00:00:00"
 
-    with pytest.raises(ValueError, match="Complex formula not supported \\(IF\\)"):
-        import_logic._extract_amounts_from_formula("=IF(A1>0,100,200)", 10, "C")
 
-    with pytest.raises(ValueError, match="Complex formula not supported \\(SUM\\)"):
-        import_logic._extract_amounts_from_formula("=SUM(A1:A5)", 10, "C")
+@pytest.fixture(scope="session")
+def sqlite_session_db():
+    """Create the schema once in an in-memory database shared by the session."""
+    mem = SqliteDatabase(":memory:", pragmas={"foreign_keys": 1})
+    with mem.bind_ctx(ALL_MODELS):
+        mem.create_tables(ALL_MODELS)
 
+    yield mem
 
-def test_extract_amounts_from_formula_rejects_negative():
-    """Test that negative values are rejected."""
-    import pytest
+    mem.close()
 
-    with pytest.raises(ValueError, match="Negative value not allowed"):
-        import_logic._extract_amounts_from_formula("=-500", 10, "C")
 
-    with pytest.raises(ValueError, match="Negative value not allowed"):
-        import_logic._extract_amounts_from_formula("=100+-600", 10, "C")
-
-
-def test_extract_amounts_from_formula_rejects_multiplication():
-    """Test that multiplication is rejected."""
-    import pytest
-
-    with pytest.raises(ValueError, match="Only addition \\(\\+\\) supported"):
-        import_logic._extract_amounts_from_formula("=43*2", 10, "C")
-
-
-def test_extract_amounts_from_formula_nested_parentheses():
-    """Test that nested parentheses are allowed and stripped correctly."""
-    result = import_logic._extract_amounts_from_formula("=((427+275)+7292)+200", 10, "C")
-    assert result == [427, 275, 7292, 200]
-
-    # Also test single-level parentheses
-    result = import_logic._extract_amounts_from_formula("=(100+200)+300", 10, "C")
-    assert result == [100, 200, 300]
-
-
-def test_extract_amounts_from_formula_budget_formulas():
-    """Test that budget formulas are correctly parsed and can be summed."""
-    # Budget cell with formula
-    result = import_logic._extract_amounts_from_formula("=1000+5200", 10, "C")
-    assert result == [1000, 5200]
-    assert sum(result) == 6200  # Should sum to 6200 for budget total
-
-    # Budget cell with more complex formula
-    result = import_logic._extract_amounts_from_formula("=2500+3000+1500", 10, "C")
-    assert result == [2500, 3000, 1500]
-    assert sum(result) == 7000
-
-
-def test_parse_excel_file(tmp_path):
+@pytest.fixture(scope="function")
+def sqlite_db(sqlite_session_db, monkeypatch):
+    """Bind all models to the session SQLite database, rolling back each test's changes."""
+    # database_manager wraps writes in database.atomic() on its module-level
+    # database, so point that at the in-memory database as well
+    monkeypatch.setattr(db, "database", sqlite_session_db)
+
+    # Writes made by the test run in savepoints nested inside this transaction
+    with sqlite_session_db.bind_ctx(ALL_MODELS):
+        with sqlite_session_db.atomic() as txn:
+            yield sqlite_session_db
+            txn.rollback()
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("=575+2182", [575, 2182]),                         # Simple addition
+    ("=104571", [104571]),                              # Single value formula
+    ("55615.0", [55615]),                               # Plain number (no formula)
+    (55615.0, [55615]),                                 # Numeric cell value
+    ("0", [0]),                                         # Zero values are included
+    ("", []),                                           # Empty cells are skipped
+    (None, []),
+    ("=((427+275)+7292)+200", [427, 275, 7292, 200]),   # Nested parentheses
+    ("=(100+200)+300", [100, 200, 300]),                # Single-level parentheses
+    ("=1000+5200", [1000, 5200]),                       # Budget formulas (summed by parser)
+    ("=2500+3000+1500", [2500, 3000, 1500]),
+])
+def test_extract_amounts_from_formula(value, expected):
+    """Test extracting amounts from formulas and plain values."""
+    assert import_logic._extract_amounts_from_formula(value, 10, "C") == expected
+
+
+@pytest.mark.parametrize("value,match", [
+    ("=IF(A1>0,100,200)", "Complex formula not supported \\(IF\\)"),
+    ("=SUM(A1:A5)", "Complex formula not supported \\(SUM\\)"),
+    ("=-500", "Negative value not allowed"),
+    ("=100+-600", "Negative value not allowed"),
+    ("=43*2", "Only addition \\(\\+\\) supported"),
+    ("=100+inf", "Invalid number format: inf"),
+    ("=1e3", "Invalid number format: 1e3"),
+    ("=1_000", "Invalid number format: 1_000"),
+    ("=(100+200", "Unbalanced parentheses"),
+    ("=)5(+6", "Unbalanced parentheses"),
+    ("=100+-0.5", "Negative value not allowed"),
+    ("=-0", "Negative value not allowed"),
+])
+def test_extract_amounts_from_formula_rejects_invalid(value, match):
+    """Test that complex formulas, negative values and multiplication are rejected."""
+    with pytest.raises(ValueError, match=match):
+        import_logic._extract_amounts_from_formula(value, 10, "C")
+
+
+def _make_fixture_xlsx(sheet_title: str, rows: list) -> BytesIO:
+    """Build a single-sheet workbook in memory (write-only mode, no disk I/O)."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    for row in rows:
+        ws.append(row)
+    buf = BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
+
+
+def _with_dimension(xlsx: BytesIO, ref: str) -> BytesIO:
+    """Copy a fixture workbook, writing a <dimension ref=...> tag into its sheet."""
+    out = BytesIO()
+    with zipfile.ZipFile(xlsx) as src, zipfile.ZipFile(out, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = data.replace(b"<sheetViews>", f'<dimension ref="{ref}"/><sheetViews>'.encode(), 1)
+            dst.writestr(item, data)
+    out.seek(0)
+    return out
+
+
+def _months(values: dict) -> list:
+    """Twelve month cells (January first) from a {month: value} dict."""
+    return [values.get(month) for month in range(1, 13)]
+
+
+def _original_category_rows(name: str, budget: dict, actuals: dict, differanse: bool) -> list:
+    """Original format category block: name in B, budget/actual rows in C-N."""
+    rows = [
+        [None, name],
+        [None, "Budsjett"] + _months(budget),
+        [None, "Resultat"] + _months(actuals),
+    ]
+    if differanse:  # Income blocks have a fourth row
+        rows.append([None, "Differanse"])
+    return rows
+
+
+def _hovedark_category_rows(name: str, budget: dict, actuals: dict) -> list:
+    """Hovedark category block: name in C, "Budsjett"/"Resultat" in D, months in F-Q."""
+    return [
+        [None, None, name, "Budsjett", None] + _months(budget),
+        [None, None, None, "Resultat", None] + _months(actuals),
+        [None, None, None, "Differanse"],
+        [None],
+    ]
+
+
+def test_parse_excel_file():
     """Test parsing Excel file structure."""
-    # Note: This test uses the real test.xlsx file
-    # For unit testing, we'd use openpyxl to create a minimal test file
-    # But for now, we'll test with the actual file structure
-
-    result = import_logic.parse_excel_file("/home/xivind/code/moneybags/test.xlsx", 2024)
+    rows = [
+        [None],
+        [None],
+        [None, "Balanse", "Januar", "Februar", "Mars", "April", "Mai", "Juni", "Juli",
+         "August", "September", "Oktober", "November", "Desember"],
+        [None], [None], [None],
+        [None, "Inntekter"],  # Row 7
+    ]
+    rows += _original_category_rows("Lønn", {1: 52000, 2: 52000}, {1: 55615, 2: "=55000+615"}, True)
+    rows += _original_category_rows("Renter", {}, {3: "=120"}, True)
+    rows += [[None]]
+    rows += [[None, "Utgifter"]]  # Row 17
+    rows += _original_category_rows("Mat", {1: "=4000+1000"}, {1: "=(812+95)+1200"}, False)
+
+    result = import_logic.parse_excel_file(_make_fixture_xlsx("Ark1", rows), 2024)
 
     assert result["year"] == 2024
     assert "sheet_categories" in result
@@ -176,17 +178,43 @@ def test_parse_excel_file(tmp_path):
     # Actuals should be dict of month: [amounts]
     assert isinstance(first_cat["actuals"], dict)
 
+    assert first_cat["name"] == "Lønn"
+    assert first_cat["type"] == "income"
+    assert first_cat["actuals"] == {1: [55615], 2: [55000, 615]}
+
+    mat = result["sheet_categories"][-1]
+    assert mat["name"] == "Mat"
+    assert mat["type"] == "expenses"
+    assert mat["budget"] == {1: 5000}
+    assert mat["actuals"] == {1: [812, 95, 1200]}
 
-def test_parse_excel_file_new_format(tmp_path):
+
+def test_parse_excel_file_new_format():
     """Test parsing Excel file with new Hovedark format."""
-    result = import_logic.parse_excel_file("/home/xivind/code/moneybags/new_format.xlsx", 2023)
+    rows = [
+        [None, None, "Hovedark", None, None, "Januar", "Februar", "Mars", "April", "Mai", "Juni",
+         "Juli", "August", "September", "Oktober", "November", "Desember"],
+        [None, None, "Utgifter"],
+    ]
+    rows += _hovedark_category_rows("Stronghold", {1: 18500}, {1: "=6571+6313+435+3475+1418"})
+    rows += _hovedark_category_rows("IT-systemer", {2: 3000}, {3: "=2438"})
+    for name in ("Mat", "Transport", "Forsikring", "Strøm", "Klær", "Helse", "Ferie", "Gaver"):
+        rows += _hovedark_category_rows(name, {1: "=1000+500"}, {1: 1200})
+    rows += _hovedark_category_rows("Totale utgifter", {1: 99999}, {1: 99999})  # Skipped
+    rows += [[None, None, "Inntekter"]]
+    rows += _hovedark_category_rows("Lønn primær arbeidsgiver", {1: 51000, 6: 80000}, {1: 52557})
+    rows += _hovedark_category_rows("Diverse inntekter og overføringer", {}, {1: "=1271+883+1947+1288"})
+
+    result = import_logic.parse_excel_file(_make_fixture_xlsx("Hovedark", rows), 2023)
 
     assert result["year"] == 2023
     assert "sheet_categories" in result
     assert len(result["sheet_categories"]) == 12  # 10 expenses + 2 income
 
+    by_name = {c["name"]: c for c in result["sheet_categories"]}
+
     # Verify Stronghold (expense)
-    stronghold = next((c for c in result["sheet_categories"] if c["name"] == "Stronghold"), None)
+    stronghold = by_name.get("Stronghold")
     assert stronghold is not None
     assert stronghold["type"] == "expenses"
     assert 1 in stronghold["budget"]
@@ -195,7 +223,7 @@ def test_parse_excel_file_new_format(tmp_path):
     assert stronghold["actuals"][1] == [6571, 6313, 435, 3475, 1418]  # Jan formula
 
     # Verify IT-systemer (expense with sparse data)
-    it_systemer = next((c for c in result["sheet_categories"] if c["name"] == "IT-systemer"), None)
+    it_systemer = by_name.get("IT-systemer")
     assert it_systemer is not None
     assert it_systemer["type"] == "expenses"
     assert 2 in it_systemer["budget"]
@@ -204,7 +232,7 @@ def test_parse_excel_file_new_format(tmp_path):
     assert it_systemer["actuals"][3] == [2438]
 
     # Verify Lønn primær arbeidsgiver (income)
-    lonn = next((c for c in result["sheet_categories"] if c["name"] == "Lønn primær arbeidsgiver"), None)
+    lonn = by_name.get("Lønn primær arbeidsgiver")
     assert lonn is not None
     assert lonn["type"] == "income"
     assert 1 in lonn["budget"]
@@ -215,14 +243,128 @@ def test_parse_excel_file_new_format(tmp_path):
     assert lonn["actuals"][1] == [52557]
 
     # Verify Diverse inntekter (income with formulas)
-    diverse = next((c for c in result["sheet_categories"] if c["name"] == "Diverse inntekter og overføringer"), None)
+    diverse = by_name.get("Diverse inntekter og overføringer")
     assert diverse is not None
     assert diverse["type"] == "income"
     assert 1 in diverse["actuals"]
     assert diverse["actuals"][1] == [1271, 883, 1947, 1288]  # Formula with multiple values
 
 
-def test_ensure_import_payee(setup_test_db):
+def test_parse_excel_file_ignores_stale_dimension():
+    """Test month columns are read even when the sheet's <dimension> tag is too narrow."""
+    rows = [
+        [None, None, "Hovedark"],
+        [None, None, "Utgifter"],
+    ]
+    rows += _hovedark_category_rows("Mat", {12: 4000}, {12: "=812+95"})
+    rows += [[None, None, "Inntekter"]]
+    rows += _hovedark_category_rows("Lønn", {1: 51000}, {1: 52557})
+
+    xlsx = _with_dimension(_make_fixture_xlsx("Hovedark", rows), "A1:C4")
+    result = import_logic.parse_excel_file(xlsx, 2024)
+
+    by_name = {c["name"]: c for c in result["sheet_categories"]}
+    assert by_name["Mat"]["budget"] == {12: 4000}
+    assert by_name["Mat"]["actuals"] == {12: [812, 95]}
+    assert by_name["Lønn"]["actuals"] == {1: [52557]}
+
+
+def test_get_all_categories_years_used(sqlite_db):
+    """Test years_used lists template years with data, using a fixed number of queries."""
+    for category_id, name in (("cat1", "Salary"), ("cat2", "Bonus"), ("cat3", "Unused")):
+        db.create_category({"id": category_id, "name": name, "type": "income", "created_at": FIXED_TS})
+
+    # cat1: in 2023 and 2024 templates, budget data in 2023, transaction in 2024
+    # cat2: in 2024 template but no data; has a transaction in 2022 (not in template)
+    for template_id, category_id, year in (("t1", "cat1", 2023), ("t2", "cat1", 2024), ("t3", "cat2", 2024)):
+        db.create_budget_template({"id": template_id, "category_id": category_id, "year": year,
+                                   "created_at": FIXED_TS})
+    db.create_budget_entry({"id": "b1", "category_id": "cat1", "year": 2023, "month": 3, "amount": 100,
+                            "comment": None, "created_at": FIXED_TS, "updated_at": FIXED_TS})
+    for transaction_id, category_id, day in (("tx1", "cat1", "2024-05-01"), ("tx2", "cat2", "2022-01-15")):
+        db.create_transaction({"id": transaction_id, "category_id": category_id, "payee_id": None,
+                               "date": day, "amount": 50, "comment": None,
+                               "created_at": FIXED_TS, "updated_at": FIXED_TS})
+
+    with count_queries() as counter:
+        result = business_logic.get_all_categories()
+
+    # One query each for categories, template keys and data keys - independent of category count
+    assert counter.count == 3
+
+    by_id = {c["id"]: c for c in result}
+    assert by_id["cat1"]["years_used"] == [2023, 2024]
+    assert by_id["cat1"]["has_data"] is True
+    assert by_id["cat2"]["years_used"] == []
+    assert by_id["cat2"]["has_data"] is False
+    assert by_id["cat3"]["years_used"] == []
+
+
+def test_get_budget_data_for_year(sqlite_db):
+    """Test budget page data is grouped by category and month."""
+    db.create_category({"id": "cat1", "name": "Food", "type": "expenses", "created_at": FIXED_TS})
+    db.create_payee({"id": "pay1", "name": "Grocer", "type": "Generic", "created_at": FIXED_TS})
+    db.create_budget_template({"id": "t1", "category_id": "cat1", "year": 2024, "created_at": FIXED_TS})
+    db.create_budget_entry({"id": "b1", "category_id": "cat1", "year": 2024, "month": 2, "amount": 5000,
+                            "comment": "Plan", "created_at": FIXED_TS, "updated_at": FIXED_TS})
+    for transaction_id, payee_id, day in (("tx1", "pay1", "2024-02-03"), ("tx2", None, "2024-02-20")):
+        db.create_transaction({"id": transaction_id, "category_id": "cat1", "payee_id": payee_id,
+                               "date": day, "amount": 700, "comment": None,
+                               "created_at": FIXED_TS, "updated_at": FIXED_TS})
+
+    result = business_logic.get_budget_data_for_year(2024)
+
+    assert result["budget_entries"] == {"cat1": {2: {"amount": 5000, "id": "b1", "comment": "Plan"}}}
+    assert result["transactions"]["cat1"][2] == [
+        {"id": "tx1", "category_id": "cat1", "payee_id": "pay1", "payee_name": "Grocer",
+         "date": "2024-02-03", "amount": 700, "comment": None},
+        {"id": "tx2", "category_id": "cat1", "payee_id": None, "payee_name": None,
+         "date": "2024-02-20", "amount": 700, "comment": None},
+    ]
+
+
+def test_get_all_payees_usage_stats(sqlite_db):
+    """Test payee statistics come from one grouped query."""
+    db.create_category({"id": "cat1", "name": "Food", "type": "expenses", "created_at": FIXED_TS})
+    for payee_id, name in (("pay1", "Grocer"), ("pay2", "Bakery")):
+        db.create_payee({"id": payee_id, "name": name, "type": "Actual", "created_at": FIXED_TS})
+    for transaction_id, day in (("tx1", "2024-02-03"), ("tx2", "2024-03-20"), ("tx3", "2023-12-31")):
+        db.create_transaction({"id": transaction_id, "category_id": "cat1", "payee_id": "pay1",
+                               "date": day, "amount": 700, "comment": None,
+                               "created_at": FIXED_TS, "updated_at": FIXED_TS})
+
+    with count_queries() as counter:
+        result = business_logic.get_all_payees()
+
+    assert counter.count == 2  # Payees + grouped statistics
+
+    by_id = {p["id"]: p for p in result}
+    assert by_id["pay1"]["transaction_count"] == 3
+    assert by_id["pay1"]["last_used"] == "2024-03-20"
+    assert by_id["pay2"]["transaction_count"] == 0
+    assert by_id["pay2"]["last_used"] is None
+
+
+def test_configuration_value_cached_until_update(sqlite_db):
+    """Test config lookups hit the database once (even when empty) until an update."""
+    business_logic._invalidate_config_cache()
+
+    with count_queries() as counter:
+        assert business_logic.get_configuration_value("currency_format") is None
+        assert business_logic.get_configuration_value("currency_format") is None
+    assert counter.count == 1
+
+    business_logic.update_configuration({"currency_format": "nok"})
+
+    with count_queries() as counter:
+        assert business_logic.get_configuration_value("currency_format") == "nok"
+        assert business_logic.get_all_configuration() == {"currency_format": "nok"}
+    assert counter.count == 1
+
+    business_logic._invalidate_config_cache()
+
+
+def test_ensure_import_payee(sqlite_db):
     """Test getting or creating import payee."""
     # First call should create payee
     payee_id = import_logic._ensure_import_payee()
@@ -239,16 +381,14 @@ def test_ensure_import_payee(setup_test_db):
     assert payee_id_2 == payee_id
 
 
-def test_validate_import(setup_test_db):
+def test_validate_import(sqlite_db):
     """Test import validation."""
-    from datetime import datetime
-
     # Create test categories
     cat1_data = {
         "id": "cat1",
         "name": "Salary",
         "type": "income",
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "created_at": FIXED_TS
     }
     db.create_category(cat1_data)
 
@@ -279,7 +419,40 @@ def test_validate_import(setup_test_db):
     assert result["summary"]["transaction_count"] == 1
 
 
-def test_validate_import_missing_category(setup_test_db):
+def test_validate_import_warns_on_existing_budget_entry(sqlite_db):
+    """Test validation warns (but passes) when a budget entry will be overwritten."""
+    db.create_category({"id": "cat1", "name": "Salary", "type": "income", "created_at": FIXED_TS})
+    db.create_budget_entry({
+        "id": "budget1",
+        "category_id": "cat1",
+        "year": 2024,
+        "month": 1,
+        "amount": 40000,
+        "comment": None,
+        "created_at": FIXED_TS,
+        "updated_at": FIXED_TS
+    })
+
+    parsed_data = {
+        "year": 2024,
+        "sheet_categories": [
+            {
+                "name": "Lønn",
+                "type": "income",
+                "budget": {1: 50000, 2: 50000},
+                "actuals": {}
+            }
+        ]
+    }
+
+    result = import_logic.validate_import(parsed_data, {"Lønn": "cat1"})
+
+    assert result["valid"] is True
+    assert result["warnings"] == ["Budget entry for 'Salary' 2024-01 already exists - will overwrite"]
+    assert result["summary"]["budget_count"] == 2
+
+
+def test_validate_import_missing_category(sqlite_db):
     """Test validation fails for missing category."""
     parsed_data = {
         "year": 2024,
@@ -305,16 +478,14 @@ def test_validate_import_missing_category(setup_test_db):
     assert any("does not exist" in err.lower() for err in result["errors"])
 
 
-def test_import_budget_and_transactions(setup_test_db):
+def test_import_budget_and_transactions(sqlite_db):
     """Test full import execution."""
-    from datetime import datetime
-
     # Create test category
     cat_data = {
         "id": "cat_import",
         "name": "Test Import Cat",
         "type": "income",
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "created_at": FIXED_TS
     }
     db.create_category(cat_data)
 
@@ -350,18 +521,118 @@ def test_import_budget_and_transactions(setup_test_db):
     assert budget_feb is not None
     assert budget_feb.amount == 52000
 
-    # Verify transactions created
-    transactions = list(Transaction.select().where(
-        Transaction.category_id == "cat_import"
-    ))
-    assert len(transactions) == 3
+    # Verify transactions created (COUNT(*) - no need to load the rows)
+    imported = Transaction.select().where(Transaction.category_id == "cat_import")
+    assert imported.count() == 3
 
-    # Verify payee
+    # Verify payee - select the raw foreign key column instead of loading
+    # each transaction and lazily fetching its Payee
     import_payee = db.get_payee_by_name("Import - Google Sheets")
     assert import_payee is not None
-    for tx in transactions:
-        # tx.payee_id is a Payee object (PeeWee foreign key), so access .id
-        assert tx.payee_id.id == import_payee.id
+    payee_ids = set(imported.select(Transaction.payee_id).tuples())
+    assert payee_ids == {(import_payee.id,)}
 
     # Verify budget template entry was created
     assert db.budget_template_exists(2024, "cat_import") is True
+
+
+def test_import_budget_and_transactions_rolls_back(sqlite_db, monkeypatch):
+    """Test a failed transaction insert leaves no budget entries or template behind."""
+    db.create_category({"id": "cat_import", "name": "Test Import Cat", "type": "income",
+                        "created_at": FIXED_TS})
+    parsed_data = {
+        "year": 2024,
+        "sheet_categories": [
+            {"name": "Test Import Cat", "type": "income", "budget": {1: 50000}, "actuals": {1: [100, 200]}}
+        ]
+    }
+
+    # Budget entry gets "b1", both transactions get "t1" - the second INSERT row collides
+    monkeypatch.setattr(import_logic, "generate_uids", lambda count: ["b1", "t1", "t1"])
+
+    with pytest.raises(IntegrityError):
+        import_logic.import_budget_and_transactions(parsed_data, {"Test Import Cat": "cat_import"})
+
+    assert BudgetEntry.select().where(BudgetEntry.category_id == "cat_import").count() == 0
+    assert Transaction.select().where(Transaction.category_id == "cat_import").count() == 0
+    assert db.budget_template_exists(2024, "cat_import") is False
+
+
+def test_supersaver_entry_not_found(sqlite_db, caplog):
+    """Test updating/deleting a missing supersaver entry raises ValueError without DB error logs."""
+    category = supersaver_business_logic.create_supersaver_category("Buffer")
+
+    with pytest.raises(ValueError, match="Supersaver entry missing not found"):
+        supersaver_business_logic.update_supersaver_entry("missing", category["id"], 100, "2024-01-15")
+    with pytest.raises(ValueError, match="Supersaver entry missing not found"):
+        supersaver_business_logic.delete_supersaver_entry("missing")
+
+    # Not-found is a business outcome, not a failed transaction
+    assert "Transaction failed" not in caplog.text
+
+
+def test_supersaver_update_and_delete(sqlite_db):
+    """Test existing supersaver entries/categories can be updated and deleted."""
+    category = supersaver_business_logic.create_supersaver_category("Buffer")
+    entry = supersaver_business_logic.create_supersaver_entry(category["id"], 100, "2024-01-15")
+
+    updated = supersaver_business_logic.update_supersaver_entry(entry["id"], category["id"], 250, "2024-01-16")
+    assert updated["amount"] == 250
+    assert updated["date"] == "2024-01-16"
+
+    supersaver_business_logic.delete_supersaver_entry(entry["id"])
+    with pytest.raises(ValueError, match="not found"):
+        supersaver_business_logic.delete_supersaver_entry(entry["id"])
+
+    supersaver_business_logic.delete_supersaver_category(category["id"])
+    with pytest.raises(ValueError, match="not found"):
+        supersaver_business_logic.update_supersaver_category(category["id"], "Renamed")
+    with pytest.raises(ValueError, match="not found"):
+        supersaver_business_logic.delete_supersaver_category(category["id"])
+
+
+def test_supersaver_dashboard_summary_january(sqlite_db, monkeypatch):
+    """Test January compares against December of the previous year."""
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2025, 1, 20, 12, 0, 0)
+
+    buffer = supersaver_business_logic.create_supersaver_category("Buffer")
+    travel = supersaver_business_logic.create_supersaver_category("Travel")
+    for category, amount, date_str in (
+        (buffer, 1000, "2024-11-30"),    # Outside range
+        (buffer, 3000, "2024-12-01"),    # Previous month
+        (travel, 2000, "2024-12-31"),
+        (buffer, 1500, "2025-01-01"),    # This month
+        (travel, 500, "2025-01-19"),
+        (buffer, 9999, "2026-01-01"),    # Outside range
+    ):
+        supersaver_business_logic.create_supersaver_entry(category["id"], amount, date_str)
+
+    monkeypatch.setattr(supersaver_business_logic, "datetime", FixedDatetime)
+
+    assert supersaver_business_logic.get_supersaver_dashboard_summary() == {
+        "saved_this_month": 2000,
+        "saved_this_year": 2000,
+        "month_trend": "down",
+    }
+
+
+def test_supersaver_heatmap_year(sqlite_db):
+    """Test deposits are summed per day across categories, within the year only."""
+    buffer = supersaver_business_logic.create_supersaver_category("Buffer")
+    travel = supersaver_business_logic.create_supersaver_category("Travel")
+    for category, amount, date_str in (
+        (buffer, 1000, "2024-03-05"),
+        (travel, 250, "2024-03-05"),
+        (buffer, 400, "2024-12-31"),
+        (buffer, 7000, "2025-01-01"),    # Next year
+    ):
+        supersaver_business_logic.create_supersaver_entry(category["id"], amount, date_str)
+
+    assert supersaver_business_logic.get_supersaver_heatmap_year(2024) == {
+        "year": 2024,
+        "days": {"2024-03-05": 1250, "2024-12-31": 400},
+        "total_saved": 1650,
+    }
@@ -1,15 +1,31 @@
 """
 Tests for database_manager.py
 
-Tests CRUD operations for the import feature.
+Tests CRUD operations for the import feature. These run against the MySQL
+test server and are marked as integration tests (skip with -m "not integration").
 """
 
 import pytest
-from datetime import datetime
 import pymysql
+from pymysql.constants import CLIENT
 from database_model import database, Category, Payee, BudgetEntry, BudgetTemplate, Transaction, Configuration
 import database_manager as db
 
+pytestmark = pytest.mark.integration
+
+
+# Placeholder for created_at/updated_at - tests never assert on timestamps
+FIXED_TS = "2024-01-01 00:00:00"
+
+
+# Per-test cleanup statements, sent as one batch by setup_test_db
+CLEANUP_SQL = "; ".join(
+    ["SET FOREIGN_KEY_CHECKS=0"]
+    + [f"TRUNCATE TABLE {model._meta.table_name}"
+       for model in (Transaction, BudgetEntry, BudgetTemplate, Payee, Category, Configuration)]
+    + ["SET FOREIGN_KEY_CHECKS=1"]
+)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def create_test_database():
@@ -28,17 +44,17 @@ def create_test_database():
         conn.close()
 
 
-@pytest.fixture(scope="function")
-def setup_test_db():
-    """Setup test database before each test, teardown after."""
-    # Initialize test database
+@pytest.fixture(scope="session")
+def db_connection(create_test_database):
+    """Initialize connection pool and create tables once per test session."""
     db.initialize_connection(
         host="sandbox",
         port=3306,
         database_name="moneybags_test",
         user="root",
         password="devpassword",
-        pool_size=5
+        pool_size=5,
+        client_flag=CLIENT.MULTI_STATEMENTS  # Lets teardown send all cleanup SQL at once
     )
 
     # Create tables
@@ -46,19 +62,27 @@ def setup_test_db():
 
     yield
 
-    # Cleanup - truncate all tables and close connection
+    db.close_connection()
+
+
+@pytest.fixture(scope="function")
+def setup_test_db(db_connection):
+    """Provide test database to each test, clean up all tables after."""
+    yield
+
+    # Cleanup - truncate all tables (schema and connection pool are kept for next test)
+    # TRUNCATE is O(1) in InnoDB, but requires foreign key checks to be disabled.
+    # Sent as one multi-statement batch: a single round-trip per test.
     try:
-        # Truncate tables instead of dropping them (faster and preserves schema)
-        Transaction.delete().execute()
-        BudgetEntry.delete().execute()
-        BudgetTemplate.delete().execute()
-        Payee.delete().execute()
-        Category.delete().execute()
-        Configuration.delete().execute()
+        cursor = database.execute_sql(CLEANUP_SQL)
+        while cursor.nextset():  # Drain remaining results so the connection stays usable
+            pass
     except:
-        pass  # Ignore errors during cleanup
-    finally:
-        db.close_connection()
+        # Ignore errors during cleanup, but don't leave FK checks off on a pooled connection
+        try:
+            database.execute_sql("SET FOREIGN_KEY_CHECKS=1")
+        except:
+            pass
 
 
 def test_get_payee_by_name(setup_test_db):
@@ -68,7 +92,7 @@ def test_get_payee_by_name(setup_test_db):
         "id": "test123",
         "name": "Test Payee",
         "type": "Generic",
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "created_at": FIXED_TS
     }
     db.create_payee(payee_data)
 
@@ -89,7 +113,7 @@ def test_create_or_update_budget_entry(setup_test_db):
         "id": "cat123",
         "name": "Test Category",
         "type": "Expense",
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "created_at": FIXED_TS
     }
     db.create_category(category_data)
 
@@ -105,8 +129,8 @@ def test_create_or_update_budget_entry(setup_test_db):
         "month": month,
         "amount": 50000,
         "comment": "Initial",
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "created_at": FIXED_TS,
+        "updated_at": FIXED_TS
     }
     result = db.create_or_update_budget_entry(data)
     assert result.amount == 50000
@@ -115,15 +139,60 @@ def test_create_or_update_budget_entry(setup_test_db):
     # Update existing entry
     data["amount"] = 60000
     data["comment"] = "Updated"
-    data["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    data["updated_at"] = FIXED_TS
     result = db.create_or_update_budget_entry(data)
     assert result.amount == 60000
     assert result.comment == "Updated"
 
     # Verify only one entry exists
-    entries = list(BudgetEntry.select().where(
+    entry_count = BudgetEntry.select().where(
         (BudgetEntry.category_id == category_id) &
         (BudgetEntry.year == year) &
         (BudgetEntry.month == month)
-    ))
-    assert len(entries) == 1
+    ).count()
+    assert entry_count == 1
+
+
+def test_bulk_create_or_update_budget_entries(setup_test_db):
+    """Test bulk creating and updating budget entries."""
+    category_data = {
+        "id": "cat456",
+        "name": "Bulk Category",
+        "type": "expenses",
+        "created_at": FIXED_TS
+    }
+    db.create_category(category_data)
+
+    # Existing entry for January should be updated, not duplicated
+    db.create_or_update_budget_entry({
+        "id": "bulk_jan",
+        "category_id": "cat456",
+        "year": 2024,
+        "month": 1,
+        "amount": 1000,
+        "comment": "Existing",
+        "created_at": FIXED_TS,
+        "updated_at": FIXED_TS
+    })
+
+    rows = [
+        {"id": "bulk_new1", "category_id": "cat456", "year": 2024, "month": 1,
+         "amount": 2000, "comment": None, "created_at": FIXED_TS, "updated_at": FIXED_TS},
+        {"id": "bulk_new2", "category_id": "cat456", "year": 2024, "month": 2,
+         "amount": 3000, "comment": None, "created_at": FIXED_TS, "updated_at": FIXED_TS},
+        # Duplicate within batch - later row wins
+        {"id": "bulk_new3", "category_id": "cat456", "year": 2024, "month": 2,
+         "amount": 3500, "comment": None, "created_at": FIXED_TS, "updated_at": FIXED_TS},
+    ]
+    count = db.bulk_create_or_update_budget_entries(rows)
+    assert count == 3
+
+    budget_jan = db.get_budget_entry("cat456", 2024, 1)
+    assert budget_jan.id == "bulk_jan"
+    assert budget_jan.amount == 2000
+    assert budget_jan.comment is None
+
+    budget_feb = db.get_budget_entry("cat456", 2024, 2)
+    assert budget_feb.amount == 3500
+
+    assert BudgetEntry.select().where(BudgetEntry.category_id == "cat456").count() == 2
@@ -0,0 +1,72 @@
+"""
+Tests for database_model.py
+
+Checks that the hot lookup queries are served by the models' composite
+indexes (SQLite EXPLAIN QUERY PLAN - no MySQL server needed).
+"""
+
+import pytest
+from peewee import SqliteDatabase
+from database_model import ALL_MODELS, BudgetEntry, Transaction, Supersaver
+from utils import get_month_date_range
+
+
+@pytest.fixture(scope="module")
+def sqlite_db():
+    """Create the schema (including indexes) in an in-memory SQLite database."""
+    mem = SqliteDatabase(":memory:")
+    with mem.bind_ctx(ALL_MODELS):
+        mem.create_tables(ALL_MODELS)
+        yield mem
+
+    mem.close()
+
+
+def _query_plan(database, query) -> str:
+    """Return the EXPLAIN QUERY PLAN details for a PeeWee query as one string."""
+    sql, params = query.sql()
+    return " ".join(row[-1] for row in database.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def test_budget_entry_lookup_uses_composite_index(sqlite_db):
+    """Test (category, year, month) lookups seek the composite index."""
+    query = BudgetEntry.select().where(
+        (BudgetEntry.category_id == "cat1") &
+        (BudgetEntry.year == 2024) &
+        (BudgetEntry.month == 1)
+    )
+
+    plan = _query_plan(sqlite_db, query)
+
+    assert "USING INDEX" in plan
+    assert "category_id=? AND year=? AND month=?" in plan
+
+
+def test_transaction_category_month_uses_composite_index(sqlite_db):
+    """Test category/month transaction queries range-scan the (category_id, date) index."""
+    start_date, end_date = get_month_date_range(2024, 1)
+    query = Transaction.select().where(
+        (Transaction.category_id == "cat1") &
+        (Transaction.date >= start_date) &
+        (Transaction.date < end_date)
+    )
+
+    plan = _query_plan(sqlite_db, query)
+
+    assert "USING INDEX" in plan
+    assert "category_id=? AND date>? AND date<?" in plan
+
+
+def test_supersaver_category_month_uses_composite_index(sqlite_db):
+    """Test category/month supersaver queries range-scan the (category_id, date) index."""
+    start_date, end_date = get_month_date_range(2024, 1)
+    query = Supersaver.select().where(
+        (Supersaver.category_id == "cat1") &
+        (Supersaver.date >= start_date) &
+        (Supersaver.date < end_date)
+    )
+
+    plan = _query_plan(sqlite_db, query)
+
+    assert "USING INDEX" in plan
+    assert "category_id=? AND date>? AND date<?" in plan